@@ -1,6 +1,6 @@
-from dataclasses import dataclass
-from typing import Set, Dict, Any, Optional, List
-from clients import generate_query, query_db
+from dataclasses import dataclass, field
+from typing import Set, Dict, Any, Optional, List, Tuple
+from clients import generate_query, query_db, name_index
 from pandas import DataFrame
 
 
@@ -25,6 +25,8 @@ class EvalResult:
     data_correct: bool
     error_message: Optional[str] = None
     actual_results: Optional[List[Dict]] = None
+    executed_sql: Optional[str] = None  # generated_sql after name rewriting
+    substitutions: List[Tuple[str, Tuple[str, ...]]] = field(default_factory=list)
 
 
 class CFGSQLEvaluator:
@@ -34,15 +36,23 @@ class CFGSQLEvaluator:
         self,
         query_generator: generate_query.QueryGenerator,
         query_db_client: query_db.QueryDB,
+        name_index_client: Optional[name_index.NameIndex] = None,
     ):
         self.query_gen = query_generator
         self.query_db = query_db_client
+        self.name_index = name_index_client
 
     def generate_sql(self, natural_language: str) -> str:
         supporting_prompt = f"Generate a query for the Tinybird baby_names dataset for the following request: {natural_language}. Do not impose any constraints beyond what is described in the request."
         query = self.query_gen.generate_query(supporting_prompt)
         return query
 
+    def rewrite_names(self, sql: str) -> (str, List[Tuple[str, Tuple[str, ...]]]):
+        """Rewrite name literals if a name index was provided"""
+        if self.name_index is None:
+            return sql, []
+        return self.name_index.canonicalize_query(sql)
+
     def execute_query(self, sql: str) -> (DataFrame, Exception):
         """Execute SQL query and return results"""
         try:
@@ -78,9 +88,10 @@ class CFGSQLEvaluator:
         """Evaluate a single test case"""
         # Generate SQL
         generated_sql = self.generate_sql(test_case.natural_language)
+        executed_sql, substitutions = self.rewrite_names(generated_sql)
 
         # Execute query
-        actual_results, error_message = self.execute_query(generated_sql)
+        actual_results, error_message = self.execute_query(executed_sql)
 
         # Check successful execution
         success = not error_message
@@ -107,6 +118,8 @@ class CFGSQLEvaluator:
             data_correct=data_correct,
             error_message=error_message,
             actual_results=actual_results,
+            executed_sql=executed_sql,
+            substitutions=substitutions,
         )
 
     def run_evaluation(self, test_cases: List[TestCase]) -> Dict[str, Any]:
@@ -0,0 +1,148 @@
+import re
+from bisect import bisect_left
+from difflib import get_close_matches
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from clients import query_db
+
+FIXTURE_PATH = (
+    Path(__file__).resolve().parent.parent
+    / "tinybird"
+    / "fixtures"
+    / "Popular_Baby_Names.csv"
+)
+FIXTURE_NAME_COLUMN = "Child's First Name"
+
+DISTINCT_NAMES_SQL = (
+    "SELECT DISTINCT child_s_first_name FROM baby_names FORMAT CSVWithNames"
+)
+
+# Matches `child_s_first_name = 'literal'` as produced by the grammar's
+# child_s_first_name_condition. Other comparators are never rewritten: an
+# absent name under `!=` excludes nothing, and substituting it would filter.
+NAME_CONDITION = re.compile(
+    r"(?P<column>child_s_first_name)\s*=\s*'(?P<name>[^']*)'"
+)
+
+
+class NameIndex:
+    """Sorted index of the distinct child_s_first_name values"""
+
+    def __init__(self, names: Iterable[str]):
+        self._index = self._build(names)
+
+    @staticmethod
+    def _build(
+        names: Iterable[str],
+    ) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[Tuple[str, ...], ...]]:
+        names = tuple(sorted(set(names)))
+
+        # The dataset spells the same name differently by year ('KEVIN' for
+        # 2011-2012, 'Kevin' afterwards), so each case-insensitive key maps
+        # to every spelling of it.
+        spellings = {}
+        for name in names:
+            spellings.setdefault(name.casefold(), []).append(name)
+        keys = tuple(sorted(spellings))
+        return names, keys, tuple(tuple(spellings[k]) for k in keys)
+
+    @classmethod
+    def from_fixture(cls, path: Path = FIXTURE_PATH) -> "NameIndex":
+        """Build the index from the local CSV fixture"""
+        df = pd.read_csv(path, usecols=[FIXTURE_NAME_COLUMN], dtype=str)
+        return cls(df[FIXTURE_NAME_COLUMN].dropna())
+
+    @classmethod
+    def from_datasource(cls, query_db_client: query_db.QueryDB) -> "NameIndex":
+        """Build the index from the live baby_names datasource"""
+        index = cls([])
+        index.refresh(query_db_client)
+        return index
+
+    def refresh(self, query_db_client: query_db.QueryDB) -> None:
+        """Reload the index in place from the live datasource"""
+        df = query_db_client.query_db(DISTINCT_NAMES_SQL)
+        if "child_s_first_name" not in df.columns:
+            raise ValueError(
+                f"Unexpected response while loading names: {df.to_string()[:200]}"
+            )
+        # Swap the whole index in one assignment; instances are shared
+        # across Streamlit sessions.
+        self._index = self._build(df["child_s_first_name"].dropna().astype(str))
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return self._index[0]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        """Exact (case-sensitive) membership in O(log n)"""
+        names = self.names
+        i = bisect_left(names, name)
+        return i < len(names) and names[i] == name
+
+    def with_prefix(self, prefix: str) -> List[str]:
+        """Return all names starting with prefix (case-sensitive)"""
+        names = self.names
+        start = bisect_left(names, prefix)
+        end = bisect_left(names, prefix + "\U0010ffff", lo=start)
+        return list(names[start:end])
+
+    def spellings(self, name: str) -> Tuple[str, ...]:
+        """Return every spelling of name in the data, ignoring case"""
+        _, keys, spellings = self._index
+        key = name.casefold()
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            return spellings[i]
+        return ()
+
+    def suggest(
+        self, name: str, n: int = 3, cutoff: float = 0.8
+    ) -> List[Tuple[str, ...]]:
+        """Return the spellings of up to n names closest to a misspelled name"""
+        keys = self._index[1]
+        matches = get_close_matches(name.casefold(), keys, n=n, cutoff=cutoff)
+        return [self.spellings(match) for match in matches]
+
+    def resolve(self, name: str, fuzzy: bool = False) -> Tuple[str, ...]:
+        """Return every spelling of name, or () if it is unknown.
+
+        With fuzzy, fall back to the nearest suggestion for misspellings.
+        """
+        spellings = self.spellings(name)
+        if spellings or not fuzzy:
+            return spellings
+        suggestions = self.suggest(name, n=1)
+        return suggestions[0] if suggestions else ()
+
+    def canonicalize_query(
+        self, sql: str, fuzzy: bool = False
+    ) -> Tuple[str, List[Tuple[str, Tuple[str, ...]]]]:
+        """Rewrite child_s_first_name = literals to match every spelling.
+
+        Returns the rewritten sql and the (original, spellings) pairs that
+        were substituted. Literals that are already the only spelling, or
+        that have no match, are left unchanged.
+        """
+        substitutions = []
+
+        def replace(match: re.Match) -> str:
+            name = match.group("name")
+            spellings = tuple(
+                s for s in self.resolve(name, fuzzy=fuzzy) if "'" not in s
+            )
+            if not spellings or spellings == (name,):
+                return match.group(0)
+            substitutions.append((name, spellings))
+            if len(spellings) == 1:
+                return f"{match.group('column')} = '{spellings[0]}'"
+            values = ", ".join(f"'{s}'" for s in spellings)
+            return f"{match.group('column')} IN ({values})"
+
+        return NAME_CONDITION.sub(replace, sql), substitutions
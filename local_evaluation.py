@@ -2,11 +2,12 @@
 """
 Local evaluation script for CFG Grammar SQL generation.
 Expects environment variables: OPENAI_API_KEY and TINYBIRD_TOKEN
+Set CANONICALIZE_NAMES=1 to rewrite name literals before execution
 """
 
 import os
 import sys
-from clients import generate_query, query_db, evaluation
+from clients import generate_query, query_db, evaluation, name_index
 
 
 def main():
@@ -15,6 +16,7 @@ def main():
     # Check for required environment variables
     openai_token = os.getenv("OPENAI_API_KEY")
     tinybird_token = os.getenv("TINYBIRD_TOKEN")
+    canonicalize_names = os.getenv("CANONICALIZE_NAMES") == "1"
 
     if not openai_token:
         print("❌ Error: OPENAI_API_KEY environment variable not set")
@@ -30,8 +32,15 @@ def main():
     try:
         query_generator = generate_query.QueryGenerator(openai_token)
         query_db_client = query_db.QueryDB(tinybird_token)
-        evaluator = evaluation.CFGSQLEvaluator(query_generator, query_db_client)
+        name_index_client = None
+        if canonicalize_names:
+            name_index_client = name_index.NameIndex.from_fixture()
+        evaluator = evaluation.CFGSQLEvaluator(
+            query_generator, query_db_client, name_index_client
+        )
         print("✅ Clients initialized successfully")
+        if canonicalize_names:
+            print("ℹ️  Name literals will be rewritten before execution")
     except Exception as e:
         print(f"❌ Error initializing clients: {e}")
         sys.exit(1)
@@ -89,6 +98,11 @@ def main():
 
         print(f"  Generated SQL: {result.generated_sql}")
 
+        for original, spellings in result.substitutions:
+            print(f"  Name '{original}' matched as: {', '.join(spellings)}")
+        if result.executed_sql != result.generated_sql:
+            print(f"  Executed SQL: {result.executed_sql}")
+
         if result.actual_results is not None and not result.actual_results.empty:
             print(f"  Actual results shape: {result.actual_results.shape}")
             if len(result.actual_results) <= 5:
@@ -0,0 +1,122 @@
+import pandas as pd
+import pytest
+
+from clients.name_index import NameIndex
+
+
+@pytest.fixture
+def index():
+    # Uppercase spellings come from 2011-2012 rows, mixed case from later years
+    return NameIndex(["SOPHIA", "Sophia", "SOPHIE", "SOFIA", "KEVIN", "Kevin", "ZOE"])
+
+
+class FakeQueryDB:
+    def __init__(self, df):
+        self.df = df
+
+    def query_db(self, sql):
+        return self.df
+
+
+def test_contains_is_exact(index):
+    assert "SOPHIA" in index
+    assert "Sophia" in index
+    assert "sophia" not in index
+    assert "SOPH" not in index
+    assert "" not in index
+    assert len(index) == 7
+
+
+def test_with_prefix_boundaries(index):
+    assert index.with_prefix("SOPH") == ["SOPHIA", "SOPHIE"]
+    assert index.with_prefix("SO") == ["SOFIA", "SOPHIA", "SOPHIE"]
+    assert index.with_prefix("SOPHIA") == ["SOPHIA"]
+    assert index.with_prefix("Soph") == ["Sophia"]
+    assert index.with_prefix("ZOE") == ["ZOE"]
+    assert index.with_prefix("ZZ") == []
+    assert index.with_prefix("A") == []
+    assert len(index.with_prefix("")) == 7
+
+
+def test_spellings(index):
+    assert index.spellings("kevin") == ("KEVIN", "Kevin")
+    assert index.spellings("Sophia") == ("SOPHIA", "Sophia")
+    assert index.spellings("zoe") == ("ZOE",)
+    assert index.spellings("Kevn") == ()
+
+
+def test_suggest(index):
+    assert index.suggest("Kevn") == [("KEVIN", "Kevin")]
+    assert index.suggest("Sophiaa", n=1) == [("SOPHIA", "Sophia")]
+    assert index.suggest("Bartholomew") == []
+
+
+def test_resolve(index):
+    assert index.resolve("Kevn") == ()
+    assert index.resolve("Kevn", fuzzy=True) == ("KEVIN", "Kevin")
+    assert index.resolve("ZOE") == ("ZOE",)
+
+
+def test_canonicalize_query_matches_every_spelling():
+    index = NameIndex(["KEVIN", "Kevin"])
+    sql = "SELECT count FROM baby_names WHERE child_s_first_name = 'kevin' AND year_of_birth = 2019 FORMAT CSVWithNames"
+    rewritten, substitutions = index.canonicalize_query(sql)
+    assert "child_s_first_name IN ('KEVIN', 'Kevin') AND year_of_birth = 2019" in rewritten
+    assert substitutions == [("kevin", ("KEVIN", "Kevin"))]
+
+
+def test_canonicalize_query_exact_mixed_case_matches_every_spelling(index):
+    sql = "SELECT count FROM baby_names WHERE child_s_first_name='Sophia' FORMAT CSVWithNames"
+    rewritten, substitutions = index.canonicalize_query(sql)
+    assert "child_s_first_name IN ('SOPHIA', 'Sophia')" in rewritten
+    assert substitutions == [("Sophia", ("SOPHIA", "Sophia"))]
+
+
+def test_canonicalize_query_single_spelling(index):
+    sql = "SELECT count FROM baby_names WHERE child_s_first_name = 'ZOE' FORMAT CSVWithNames"
+    assert index.canonicalize_query(sql) == (sql, [])
+    rewritten, substitutions = index.canonicalize_query(sql.replace("ZOE", "zoe"))
+    assert rewritten == sql
+    assert substitutions == [("zoe", ("ZOE",))]
+
+
+def test_canonicalize_query_fuzzy_is_opt_in(index):
+    sql = "SELECT count FROM baby_names WHERE child_s_first_name = 'Kevn' FORMAT CSVWithNames"
+    assert index.canonicalize_query(sql) == (sql, [])
+    rewritten, substitutions = index.canonicalize_query(sql, fuzzy=True)
+    assert "child_s_first_name IN ('KEVIN', 'Kevin')" in rewritten
+    assert substitutions == [("Kevn", ("KEVIN", "Kevin"))]
+
+
+def test_canonicalize_query_leaves_other_comparators(index):
+    sql = (
+        "SELECT count FROM baby_names WHERE child_s_first_name != 'Sophai' "
+        "AND child_s_first_name != 'kevin' AND child_s_first_name >= 'kevin' "
+        "FORMAT CSVWithNames"
+    )
+    assert index.canonicalize_query(sql, fuzzy=True) == (sql, [])
+
+
+def test_canonicalize_query_no_match(index):
+    sql = "SELECT count FROM baby_names WHERE child_s_first_name = 'Bartholomew' FORMAT CSVWithNames"
+    assert index.canonicalize_query(sql, fuzzy=True) == (sql, [])
+
+
+def test_refresh(index):
+    df = pd.DataFrame({"child_s_first_name": ["Ava", "AVA", None]})
+    index.refresh(FakeQueryDB(df))
+    assert index.names == ("AVA", "Ava")
+    assert index.spellings("ava") == ("AVA", "Ava")
+
+
+def test_refresh_rejects_error_response(index):
+    df = pd.DataFrame({'{"error": "Invalid token"}': []})
+    with pytest.raises(ValueError, match="Unexpected response"):
+        index.refresh(FakeQueryDB(df))
+    assert "KEVIN" in index
+
+
+def test_from_fixture():
+    index = NameIndex.from_fixture()
+    assert index.spellings("kevin") == ("KEVIN", "Kevin")
+    assert index.spellings("sophia") == ("SOPHIA", "Sophia")
@@ -1,5 +1,5 @@
 import streamlit as st
-from clients import generate_query, query_db, evaluation, jwt_generate
+from clients import generate_query, query_db, evaluation, jwt_generate, name_index
 import pandas as pd
 
 
@@ -9,11 +9,12 @@ def initialize_clients():
     """Initialize clients once and cache them"""
     query_generator = generate_query.QueryGenerator(st.secrets["openai_token"])
     query_db_client = query_db.QueryDB(st.secrets["tinybird_token"])
+    name_index_client = name_index.NameIndex.from_fixture()
     evaluator = evaluation.CFGSQLEvaluator(query_generator, query_db_client)
-    return query_generator, query_db_client, evaluator
+    return query_generator, query_db_client, name_index_client, evaluator
 
 
-query_generator, query_db_client, evaluator = initialize_clients()
+query_generator, query_db_client, name_index_client, evaluator = initialize_clients()
 
 st.title("Context-Free Grammar Playground")
 tab1, tab2, tab3 = st.tabs(["Query Interface", "Model Evaluation", "JWT Generator"])
@@ -53,6 +54,12 @@ with tab1:
             try:
                 supporting_prompt = f"Generate a query for the Tinybird baby_names dataset for the following request: {question}. Do not impose any constraints beyond what is described in the request."
                 query = query_generator.generate_query(supporting_prompt)
+                query, substitutions = name_index_client.canonicalize_query(
+                    query, fuzzy=True
+                )
+                for original, spellings in substitutions:
+                    searched = ", ".join(f"'{s}'" for s in spellings)
+                    st.info(f"Searched {searched} for '{original}'.")
                 data = query_db_client.query_db(query)
 
                 # Display the results